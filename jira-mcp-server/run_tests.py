@@ -8,15 +8,20 @@ import sys
 import os
 
 
-def run_command(cmd, description):
-    """Run a command and handle errors."""
+def run_command(cmd, description, quiet=False):
+    """Run a command and handle errors.
+
+    Output is streamed straight to the terminal as it is produced. With
+    quiet=True it is captured instead and only shown if the command fails.
+    """
     print(f"\n🔄 {description}")
     print(f"Running: {' '.join(cmd)}")
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if quiet:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        else:
+            subprocess.run(cmd, check=True)
         print(f"✅ {description} completed successfully")
-        if result.stdout:
-            print(result.stdout)
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed")
@@ -30,14 +35,19 @@ def run_command(cmd, description):
 def main():
     """Main test runner function."""
     if len(sys.argv) < 2:
-        print("Usage: python run_tests.py [unit|integration|all|coverage]")
+        print("Usage: python run_tests.py [unit|integration|all|coverage|failed|fast|benchmark] [--quiet]")
         print("  unit        - Run unit tests only")
         print("  integration - Run integration tests only")
         print("  all         - Run all tests")
         print("  coverage    - Run all tests with coverage report")
+        print("  failed      - Re-run only the tests that failed last time, stop at first failure")
+        print("  fast        - Run all tests, last failures first")
+        print("  benchmark   - Run the benchmarks only")
+        print("  --quiet     - Only show test output when a run fails")
         sys.exit(1)
 
     test_type = sys.argv[1].lower()
+    quiet = "--quiet" in sys.argv[2:]
     
     # Change to project directory
     project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -45,29 +55,35 @@ def main():
     
     if test_type == "unit":
         cmd = ["python", "-m", "pytest", "tests/test_main.py", "tests/test_jira_api_adapter.py", "-v"]
-        run_command(cmd, "Running unit tests")
+        run_command(cmd, "Running unit tests", quiet)
         
     elif test_type == "integration":
         cmd = ["python", "-m", "pytest", "tests/test_integration.py", "-v", "-m", "integration"]
-        run_command(cmd, "Running integration tests")
+        run_command(cmd, "Running integration tests", quiet)
         
     elif test_type == "all":
         cmd = ["python", "-m", "pytest", "tests/", "-v"]
-        run_command(cmd, "Running all tests")
+        run_command(cmd, "Running all tests", quiet)
         
     elif test_type == "coverage":
-        # Install coverage if not available
-        try:
-            import coverage
-        except ImportError:
-            print("Installing coverage...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "coverage"], check=True)
-        
-        cmd = ["python", "-m", "coverage", "run", "-m", "pytest", "tests/"]
-        if run_command(cmd, "Running tests with coverage"):
-            run_command(["python", "-m", "coverage", "report"], "Generating coverage report")
-            run_command(["python", "-m", "coverage", "html"], "Generating HTML coverage report")
+        # pytest-cov combines the per-worker data files produced under xdist
+        cmd = ["python", "-m", "pytest", "tests/", "--cov=src", "--cov-report=term", "--cov-report=html"]
+        if run_command(cmd, "Running tests with coverage", quiet):
             print("📊 HTML coverage report generated in htmlcov/index.html")
+    elif test_type == "failed":
+        # Both modes read the last run's results from .pytest_cache
+        cmd = ["python", "-m", "pytest", "tests/", "--lf", "-x"]
+        run_command(cmd, "Re-running last failed tests", quiet)
+
+    elif test_type == "fast":
+        cmd = ["python", "-m", "pytest", "tests/", "--ff"]
+        run_command(cmd, "Running tests, last failures first", quiet)
+
+    elif test_type == "benchmark":
+        # pytest-benchmark disables itself under xdist, so run in one process
+        cmd = ["python", "-m", "pytest", "tests/test_benchmarks.py", "--benchmark-only", "-n", "0"]
+        run_command(cmd, "Running benchmarks", quiet)
+
     else:
         print(f"Unknown test type: {test_type}")
         sys.exit(1)
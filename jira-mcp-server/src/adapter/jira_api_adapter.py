@@ -1,9 +1,17 @@
 import os
+import time
+from collections import OrderedDict
+import orjson
 import requests
 from requests.auth import HTTPBasicAuth
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 
 class JiraApiAdapter:
+    # Seconds a fetched transition table is reused before asking Jira again
+    TRANSITIONS_CACHE_TTL = 300
+    # Issues whose transitions are kept; the least recently used is evicted
+    TRANSITIONS_CACHE_SIZE = 256
+
     def __init__(self):
         self.project_key = os.getenv("JIRA_PROJECT_KEY")
         self.base_url = f"https://{os.getenv('JIRA_DOMAIN')}/rest/api/3"
@@ -12,7 +20,29 @@ class JiraApiAdapter:
             "Accept": "application/json",
             "Content-Type": "application/json"
         }
-        
+        # One pooled session for all calls so connections are kept alive
+        # instead of paying a TCP and TLS handshake per request.
+        self._session = requests.Session()
+        self._session.auth = self.auth
+        self._session.headers.update(self.headers)
+        self._transitions_cache: OrderedDict[str, Tuple[float, List[Dict]]] = OrderedDict()
+        # URL prefixes are fixed for the adapter's lifetime
+        self._url_issue = f"{self.base_url}/issue"
+        self._url_search = f"{self.base_url}/search"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Closes the underlying HTTP session and its pooled connections."""
+        self._session.close()
+
+    def _issue_url(self, issue_key: str, resource: str = "") -> str:
+        """Returns the URL of an issue, or of one of its sub-resources."""
+        return f"{self._url_issue}/{issue_key}{resource}"
 
     def create_ticket(self, summary: str, description_text: str) -> str:
         """Creates a new Jira issue in the configured project.
@@ -25,7 +55,7 @@ class JiraApiAdapter:
         str: The key of the created Jira issue (e.g., "ABC-123").
         """
         print(summary, description_text)
-        url = f"{self.base_url}/issue"
+        url = self._url_issue
         payload = {
             "fields": {
                 "project": {"key": self.project_key},
@@ -42,9 +72,9 @@ class JiraApiAdapter:
             }
         }
 
-        response = requests.post(url, headers=self.headers, auth=self.auth, json=payload)
+        response = self._session.post(url, json=payload)
         if response.status_code == 201:
-            issue_key = response.json()["key"]
+            issue_key = orjson.loads(response.content)["key"]
             return f"ticket {issue_key} is successfully created"
         else:
             print(response.text)
@@ -60,7 +90,7 @@ class JiraApiAdapter:
             summary (str): The title update.
             description_text (str): The description to update.
         """
-        url = f"{self.base_url}/issue/{issue_key}"
+        url = self._issue_url(issue_key)
         payload = {
             "fields": {
                 "summary": summary,
@@ -75,7 +105,7 @@ class JiraApiAdapter:
             }
         }
 
-        response = requests.put(url, headers=self.headers, auth=self.auth, json=payload)
+        response = self._session.put(url, json=payload)
         if response.status_code == 204:
             return "ticket is successfully updated"
         else:
@@ -95,15 +125,15 @@ class JiraApiAdapter:
             list: A list of issue objects returned by the Jira API.
                 None if the request fails.
         """
-        url = f"{self.base_url}/search"
+        url = self._url_search
         params = {
             "jql": f"project={self.project_key}",
             "maxResults": max_results
         }
 
-        response = requests.get(url, headers=self.headers, auth=self.auth, params=params)
+        response = self._session.get(url, params=params)
         if response.status_code == 200:
-            issues = response.json()["issues"]
+            issues = orjson.loads(response.content)["issues"]
             for issue in issues:
                 print(f"{issue['key']}: {issue['fields']['summary']}")
             return issues
@@ -120,10 +150,13 @@ class JiraApiAdapter:
             issue_key (str): The key of the issue to transition.
             transition_id (str): The ID of the transition to apply.
         """
-        url = f"{self.base_url}/issue/{issue_key}/transitions"
+        url = self._issue_url(issue_key, "/transitions")
         payload = {"transition": {"id": transition_id}}
 
-        response = requests.post(url, headers=self.headers, auth=self.auth, json=payload)
+        response = self._session.post(url, json=payload)
+        # The next valid transitions depend on the new status; on failure the
+        # cached ones may be stale (e.g. the status was changed elsewhere)
+        self._transitions_cache.pop(issue_key, None)
         if response.status_code == 204:
             return "Ticket status is successfully updated"
         else:
@@ -131,23 +164,36 @@ class JiraApiAdapter:
             raise Exception(f"Error transitioning ticket {response.status_code}")
 
 
-    def get_transitions(self, issue_key: str) -> List[Optional[Dict]]:
+    def get_transitions(self, issue_key: str, refresh: bool = False) -> List[Optional[Dict]]:
         """
         Retrieves the list of available transitions for a given Jira issue.
+        Results are cached per issue for TRANSITIONS_CACHE_TTL seconds and
+        dropped after any attempt to transition the issue. At most
+        TRANSITIONS_CACHE_SIZE issues are cached, least recently used first out.
 
         Args:
             issue_key (str): The key of the issue for which to get transitions.
+            refresh (bool): Skip the cache and fetch the transitions from Jira.
 
         Returns:
             list: A list of available transitions (each as a dict with id and name).
                 None if the request fails.
         """
-        url = f"{self.base_url}/issue/{issue_key}/transitions"
-        response = requests.get(url, headers=self.headers, auth=self.auth)
+        cached = None if refresh else self._transitions_cache.get(issue_key)
+        if cached and time.monotonic() - cached[0] < self.TRANSITIONS_CACHE_TTL:
+            self._transitions_cache.move_to_end(issue_key)
+            return cached[1]
+
+        url = self._issue_url(issue_key, "/transitions")
+        response = self._session.get(url)
         if response.status_code == 200:
-            transitions = response.json()["transitions"]
+            transitions = orjson.loads(response.content)["transitions"]
             for t in transitions:
                 print(f"{t['id']}: {t['name']}")
+            self._transitions_cache[issue_key] = (time.monotonic(), transitions)
+            self._transitions_cache.move_to_end(issue_key)
+            if len(self._transitions_cache) > self.TRANSITIONS_CACHE_SIZE:
+                self._transitions_cache.popitem(last=False)
             return transitions
         else:
             print(response.text)
@@ -165,7 +211,7 @@ class JiraApiAdapter:
         Return:
             success or error information regarding comment creation
         """
-        url = f"{self.base_url}/issue/{issue_key}/comment"
+        url = self._issue_url(issue_key, "/comment")
         payload = {
             "body": {
                 "type": "doc",
@@ -177,9 +223,29 @@ class JiraApiAdapter:
             }
         }
 
-        response = requests.post(url, headers=self.headers, auth=self.auth, json=payload)
+        response = self._session.post(url, json=payload)
         if response.status_code == 201:
             return "Comment is successfully added"
         else:
             print(response.text)
-            raise Exception(f"Error adding comment {response.status_code}")
\ No newline at end of file
+            raise Exception(f"Error adding comment {response.status_code}")
+
+
+    def delete_ticket(self, issue_key: str) -> str:
+        """
+        Deletes a Jira issue.
+
+        Args:
+            issue_key (str): The key of the issue to delete.
+
+        Return:
+            success or error information regarding ticket deletion
+        """
+        url = self._issue_url(issue_key)
+        response = self._session.delete(url)
+        if response.status_code == 204:
+            self._transitions_cache.pop(issue_key, None)
+            return f"ticket {issue_key} is successfully deleted"
+        else:
+            print(response.text)
+            raise Exception(f"Error deleting ticket {response.status_code}")
\ No newline at end of file
@@ -1,16 +1,25 @@
 # import uvicorn
+import functools
 from mcp.server.fastmcp import FastMCP
 from adapter.jira_api_adapter import JiraApiAdapter
 from typing import List, Optional, Dict
 
-mcp = FastMCP(
-    name="Jira Adapter MCP Server",
-    instructions="A jira adapter server to list, create, update, and change status from slash jira"
-)
+# Built on first use so importing this module (e.g. to list tools or in
+# tests) does not create a Jira client.
+adapter: Optional[JiraApiAdapter] = None
 
-adapter = JiraApiAdapter()
+def get_adapter() -> JiraApiAdapter:
+    """
+    Return the shared jira api adapter, creating it on first use
+
+    Returns:
+        JiraApiAdapter: The adapter used by every tool.
+    """
+    global adapter
+    if adapter is None:
+        adapter = JiraApiAdapter()
+    return adapter
 
-@mcp.tool()
 def create_jira_ticket(title: str, description: str) -> str:
     """
     Call jira api adapter to create ticket
@@ -23,11 +32,10 @@ def create_jira_ticket(title: str, description: str) -> str:
         str: The key of the created Jira issue (e.g., "ABC-123") or error.
     """
     try:
-        return adapter.create_ticket(summary=title, description_text=description)
+        return get_adapter().create_ticket(summary=title, description_text=description)
     except Exception as e:
         return f"Error creating jira ticket: {str(e)}"
 
-@mcp.tool()
 def update_jira_ticket(issue_key: str, title: str, description: str) -> str:
     """
     Call jira api adapter to update ticket
@@ -42,11 +50,10 @@ def update_jira_ticket(issue_key: str, title: str, description: str) -> str:
     """
     
     try:
-        return adapter.update_ticket(issue_key=issue_key, summary=title, description_text=description)
+        return get_adapter().update_ticket(issue_key=issue_key, summary=title, description_text=description)
     except Exception as e:
         return f"Error updating jira ticket: {str(e)}"
 
-@mcp.tool()
 def list_jira_tickets(max_result: int) -> List[Optional[Dict]]:
     """
     Call jira api adapter to list tickets
@@ -59,11 +66,10 @@ def list_jira_tickets(max_result: int) -> List[Optional[Dict]]:
     """
     
     try:
-        return adapter.list_tickets(max_results=max_result)
+        return get_adapter().list_tickets(max_results=max_result)
     except Exception:
         return None
     
-@mcp.tool()
 def list_jira_statuses(ticket_no: str) -> List[Optional[Dict]]:
     """
     Call jira api adapter to list available transitions
@@ -75,11 +81,10 @@ def list_jira_statuses(ticket_no: str) -> List[Optional[Dict]]:
         list: A list of statuses returned by the Jira API. None if the request fails.
     """
     try:
-        return adapter.get_transitions(ticket_no)
+        return get_adapter().get_transitions(ticket_no)
     except Exception:
         return None
 
-@mcp.tool()
 def update_jira_status(ticket_no: str, status: str) -> str:
     """
     Call jira api adapter to do transition of issue
@@ -92,16 +97,21 @@ def update_jira_status(ticket_no: str, status: str) -> str:
         str: Success or Error of transitioning status or None if exception raised.
     """
     try:
-        transitions = adapter.get_transitions(ticket_no)
-        filtered_transitions = [t for t in transitions if t["name"] == status]
-        if filtered_transitions:
-            return adapter.transition_ticket(ticket_no, filtered_transitions[0]["id"])
+        jira_adapter = get_adapter()
+        transitions = jira_adapter.get_transitions(ticket_no)
+        transition_id = next((t["id"] for t in transitions if t["name"] == status), None)
+        if not transition_id:
+            # The cached transitions may predate a status change made outside
+            # this process, so check against a fresh list before giving up
+            transitions = jira_adapter.get_transitions(ticket_no, refresh=True)
+            transition_id = next((t["id"] for t in transitions if t["name"] == status), None)
+        if transition_id:
+            return jira_adapter.transition_ticket(ticket_no, transition_id)
         else:
             return "Status is unknown"
     except Exception:
         return None
 
-@mcp.tool()
 def add_comment_to_jira_ticket(ticket_no: str, comment: str) -> str:
     """
     Call jira api adapter to add comment to specified jira ticket
@@ -113,11 +123,10 @@ def add_comment_to_jira_ticket(ticket_no: str, comment: str) -> str:
         str: Success or Error of adding comment to jira ticket or None if exception raised.
     """
     try:
-        return adapter.add_comment(issue_key=ticket_no, comment=comment)
+        return get_adapter().add_comment(issue_key=ticket_no, comment=comment)
     except Exception:
         return None
 
-@mcp.prompt()
 def summarize_ticket(ticket_key: str) -> str:
     """
     Generate a summary prompt for a Jira ticket
@@ -130,7 +139,6 @@ def summarize_ticket(ticket_key: str) -> str:
     """
     return f"Please summarize the key details of Jira ticket {ticket_key}, including status, priority, and main issues."
 
-@mcp.prompt()
 def create_ticket_template() -> str:
     """
     Template for creating well-structured Jira tickets
@@ -140,7 +148,6 @@ def create_ticket_template() -> str:
     """
     return "Create a Jira ticket with the following structure:\n- Clear title\n- Detailed description\n- Acceptance criteria\n- Priority level"
 
-@mcp.prompt()
 def analyze_ticket_comments(ticket_key: str) -> str:
     """
     Generate a prompt for analyzing ticket comments and discussions
@@ -153,15 +160,59 @@ def analyze_ticket_comments(ticket_key: str) -> str:
     """
     return f"Analyze the comments and discussions in Jira ticket {ticket_key}. Identify key decisions, blockers, and action items."
 
+TOOLS = (
+    create_jira_ticket,
+    update_jira_ticket,
+    list_jira_tickets,
+    list_jira_statuses,
+    update_jira_status,
+    add_comment_to_jira_ticket,
+)
+
+PROMPTS = (
+    summarize_ticket,
+    create_ticket_template,
+    analyze_ticket_comments,
+)
+
+@functools.lru_cache(maxsize=1)
+def get_mcp() -> FastMCP:
+    """
+    Build the MCP server and register the tools and prompts, once
+
+    Returns:
+        FastMCP: The server exposing every tool and prompt of this module.
+    """
+    server = FastMCP(
+        name="Jira Adapter MCP Server",
+        instructions="A jira adapter server to list, create, update, and change status from slash jira"
+    )
+    for tool in TOOLS:
+        server.add_tool(tool)
+    for prompt in PROMPTS:
+        server.prompt()(prompt)
+    return server
+
+def __getattr__(name: str):
+    # Keeps `mcp run src/main.py` / `mcp dev`, which look up a module-level
+    # `mcp` object, working without building the server at import time.
+    if name == "mcp":
+        return get_mcp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def main():
     """Main entry point for the MCP server"""
     # For SSE transport (HTTP server)
     print("🚀 Starting MCP server with SSE transport...")
     print("📡 Server will be available at: http://localhost:9999")
     print("📡 Your MCP endpoint: http://localhost:9999/sse")
-    # app = mcp.sse_app
+    # app = get_mcp().sse_app
     # uvicorn.run(app, host="0.0.0.0", port=9999)
-    mcp.run(transport='stdio')
+    try:
+        get_mcp().run(transport='stdio')
+    finally:
+        if adapter is not None:
+            adapter.close()
 
 if __name__ == "__main__":
     main()
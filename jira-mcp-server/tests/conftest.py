@@ -1,17 +1,23 @@
 """
 Pytest configuration and fixtures for jira-mcp-server tests.
 """
+import orjson
 import pytest
+import requests
 from unittest.mock import Mock, patch
 import os
 import sys
+import types
 
 # Add src to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-@pytest.fixture
+from adapter.jira_api_adapter import JiraApiAdapter
+from main import TOOLS
+
+@pytest.fixture(scope="session")
 def mock_env_vars():
-    """Mock environment variables for testing."""
+    """Mock environment variables once for the whole test session."""
     env_vars = {
         'JIRA_PROJECT_KEY': 'TEST',
         'JIRA_DOMAIN': 'test.atlassian.net',
@@ -21,18 +27,45 @@ def mock_env_vars():
     with patch.dict(os.environ, env_vars):
         yield env_vars
 
+@pytest.fixture
+def mock_adapter(monkeypatch):
+    """Replace the adapter used by the main.py tools with a Mock.
+
+    Specced against JiraApiAdapter so a misspelled adapter method fails the
+    test instead of silently returning a new Mock.
+    """
+    adapter = Mock(spec=JiraApiAdapter)
+    monkeypatch.setattr("main.adapter", adapter)
+    return adapter
+
+@pytest.fixture(scope="session")
+def jira_tools():
+    """The main.py MCP tools, by function name (e.g. jira_tools.create_jira_ticket)."""
+    return types.SimpleNamespace(**{tool.__name__: tool for tool in TOOLS})
+
 @pytest.fixture
 def mock_jira_adapter():
     """Mock JiraApiAdapter for testing."""
     with patch('adapter.jira_api_adapter.JiraApiAdapter') as mock:
-        adapter_instance = Mock()
+        adapter_instance = Mock(spec=JiraApiAdapter)
         mock.return_value = adapter_instance
         yield adapter_instance
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def make_response():
+    """Factory for mocked requests responses."""
+    def _make(status=200, json=None, text=""):
+        response = Mock(spec=requests.Response)
+        response.status_code = status
+        response.content = orjson.dumps(json if json is not None else {})
+        response.text = text
+        return response
+    return _make
+
+@pytest.fixture(scope="session")
 def sample_jira_response():
-    """Sample Jira API response data."""
-    return {
+    """Sample Jira API response data, shared read-only across the session."""
+    return types.MappingProxyType({
         "create_response": {
             "key": "TEST-123",
             "id": "10001",
@@ -57,6 +90,19 @@ def sample_jira_response():
                 {"id": "31", "name": "Done"}
             ]
         }
+    })
+
+
+@pytest.fixture(scope="module")
+def vcr_config(request):
+    """Cassette settings for the real integration tests (pytest-recording).
+
+    Recorded interactions are replayed on later runs; pass
+    --record-mode=rewrite to refresh them against Jira.
+    """
+    return {
+        "filter_headers": ["authorization", "cookie"],
+        "record_mode": request.config.getoption("--record-mode") or "once",
     }
 
 
@@ -83,6 +129,6 @@ def pytest_collection_modifyitems(config, items):
     if config.getoption("--jira-real"):
         return
     skip_real = pytest.mark.skip(reason="need --jira-real option to run")
-    for item in items:
-        if "real_integration" in item.keywords:
-            item.add_marker(skip_real)
+    real_items = [item for item in items if item.get_closest_marker("real_integration")]
+    for item in real_items:
+        item.add_marker(skip_real)
@@ -0,0 +1,27 @@
+"""
+Benchmarks for the main.py MCP tool wrappers.
+Guards against the wrappers adding per-ticket overhead on large results.
+Run with: make test-benchmark
+"""
+
+# Mean seconds allowed for one list_jira_tickets call on 10,000 tickets. The
+# wrapper passes the list through untouched (~10us), so this leaves room for
+# slow CI machines while still failing on per-ticket work, let alone O(n^2).
+LIST_TICKETS_MEAN_CEILING = 0.005
+
+
+class TestToolBenchmarks:
+    """Benchmarks for the MCP tools against a mocked adapter."""
+
+    def test_list_tickets_throughput(self, benchmark, mock_adapter, jira_tools):
+        """Benchmark listing a large page of tickets through the tool."""
+        tickets = [{"key": f"T-{i}"} for i in range(10_000)]
+        mock_adapter.list_tickets.return_value = tickets
+
+        result = benchmark(jira_tools.list_jira_tickets, 10_000)
+
+        assert result is tickets
+        mock_adapter.list_tickets.assert_called_with(max_results=10_000)
+        # Timing is disabled under xdist and the call above then runs only once
+        if not benchmark.disabled:
+            assert benchmark.stats["mean"] < LIST_TICKETS_MEAN_CEILING
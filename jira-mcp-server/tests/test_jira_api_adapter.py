@@ -2,19 +2,84 @@
 Unit tests for JiraApiAdapter class.
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
 import requests
 from adapter.jira_api_adapter import JiraApiAdapter
 
 
+ISSUES = [{"key": "TEST-123", "fields": {"summary": "Test Issue"}}]
+TRANSITIONS = [
+    {"id": "11", "name": "To Do"},
+    {"id": "21", "name": "In Progress"},
+    {"id": "31", "name": "Done"}
+]
+
+# method, args, HTTP verb, success status, success body, expected result,
+# failure status, expected error
+ADAPTER_METHOD_CASES = [
+    pytest.param(
+        "create_ticket", ("Test Summary", "Test Description"), "post",
+        201, {"key": "TEST-123"}, "ticket TEST-123 is successfully created",
+        400, "Error creating ticket with status code 400",
+        id="create_ticket"
+    ),
+    pytest.param(
+        "update_ticket", ("TEST-123", "Updated Summary", "Updated Description"), "put",
+        204, None, "ticket is successfully updated",
+        404, "Error updating ticket 404",
+        id="update_ticket"
+    ),
+    pytest.param(
+        "list_tickets", (10,), "get",
+        200, {"issues": ISSUES}, ISSUES,
+        401, "Error listing tickets 401",
+        id="list_tickets"
+    ),
+    pytest.param(
+        "get_transitions", ("TEST-123",), "get",
+        200, {"transitions": TRANSITIONS}, TRANSITIONS,
+        404, "Error getting transitions 404",
+        id="get_transitions"
+    ),
+    pytest.param(
+        "transition_ticket", ("TEST-123", "21"), "post",
+        204, None, "Ticket status is successfully updated",
+        400, "Error transitioning ticket 400",
+        id="transition_ticket"
+    ),
+    pytest.param(
+        "add_comment", ("TEST-123", "Test comment"), "post",
+        201, None, "Comment is successfully added",
+        400, "Error adding comment 400",
+        id="add_comment"
+    ),
+    pytest.param(
+        "delete_ticket", ("TEST-123",), "delete",
+        204, None, "ticket TEST-123 is successfully deleted",
+        404, "Error deleting ticket 404",
+        id="delete_ticket"
+    ),
+]
+
+
 class TestJiraApiAdapter:
     """Test cases for JiraApiAdapter class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def adapter(self, mock_env_vars):
-        """Create JiraApiAdapter instance with mocked environment."""
+        """JiraApiAdapter instance with mocked environment, shared by the module."""
+        return JiraApiAdapter()
+
+    @pytest.fixture
+    def fresh_adapter(self, mock_env_vars):
+        """JiraApiAdapter instance for tests that depend on its internal state."""
         return JiraApiAdapter()
 
+    @pytest.fixture(autouse=True)
+    def clear_transitions_cache(self, adapter):
+        """Keep transitions cached by one test from answering the next."""
+        adapter._transitions_cache.clear()
+
     def test_init(self, mock_env_vars):
         """Test JiraApiAdapter initialization."""
         adapter = JiraApiAdapter()
@@ -24,175 +89,130 @@ class TestJiraApiAdapter:
         assert adapter.auth.password == "test_token"
         assert adapter.headers["Accept"] == "application/json"
         assert adapter.headers["Content-Type"] == "application/json"
+        assert adapter._session.auth is adapter.auth
+        assert adapter._session.headers["Accept"] == "application/json"
+
+    @pytest.mark.parametrize(
+        "method_name,args,http_verb,success_status,response_json,expected_result,failure_status,expected_error",
+        ADAPTER_METHOD_CASES
+    )
+    def test_adapter_method_success(self, mocker, adapter, make_response, method_name, args, http_verb,
+                                    success_status, response_json, expected_result, failure_status, expected_error):
+        """Test each adapter method on a successful response."""
+        mock_request = mocker.patch(
+            f"requests.Session.{http_verb}", return_value=make_response(success_status, response_json)
+        )
+
+        result = getattr(adapter, method_name)(*args)
+
+        assert result == expected_result
+        mock_request.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "method_name,args,http_verb,success_status,response_json,expected_result,failure_status,expected_error",
+        ADAPTER_METHOD_CASES
+    )
+    def test_adapter_method_failure(self, mocker, adapter, make_response, method_name, args, http_verb,
+                                    success_status, response_json, expected_result, failure_status, expected_error):
+        """Test each adapter method raises on an error response."""
+        mocker.patch(f"requests.Session.{http_verb}", return_value=make_response(failure_status, text="Error"))
 
-    @patch('requests.post')
-    def test_create_ticket_success(self, mock_post, adapter, sample_jira_response):
-        """Test successful ticket creation."""
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_response.json.return_value = sample_jira_response["create_response"]
-        mock_post.return_value = mock_response
-
-        result = adapter.create_ticket("Test Summary", "Test Description")
-        
-        assert result == "ticket TEST-123 is successfully created"
-        mock_post.assert_called_once()
-        
-        # Verify the payload structure
-        call_args = mock_post.call_args
-        payload = call_args[1]['json']
+        with pytest.raises(Exception) as exc_info:
+            getattr(adapter, method_name)(*args)
+
+        assert expected_error in str(exc_info.value)
+
+    @patch('requests.Session.post')
+    def test_create_ticket_payload(self, mock_post, adapter, sample_jira_response, make_response):
+        """Test the payload sent when creating a ticket."""
+        mock_post.return_value = make_response(201, sample_jira_response["create_response"])
+
+        adapter.create_ticket("Test Summary", "Test Description")
+
+        assert mock_post.call_args[0][0] == "https://test.atlassian.net/rest/api/3/issue"
+        payload = mock_post.call_args[1]['json']
         assert payload['fields']['summary'] == "Test Summary"
         assert payload['fields']['project']['key'] == "TEST"
         assert payload['fields']['issuetype']['name'] == "Task"
 
-    @patch('requests.post')
-    def test_create_ticket_failure(self, mock_post, adapter):
-        """Test ticket creation failure."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-        mock_post.return_value = mock_response
+    @patch('requests.Session.get')
+    def test_get_transitions_cached(self, mock_get, fresh_adapter, sample_jira_response, make_response):
+        """Test repeated transitions lookups reuse the first response."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.create_ticket("Test Summary", "Test Description")
-        
-        assert "Error creating ticket with status code 400" in str(exc_info.value)
-
-    @patch('requests.put')
-    def test_update_ticket_success(self, mock_put, adapter):
-        """Test successful ticket update."""
-        mock_response = Mock()
-        mock_response.status_code = 204
-        mock_put.return_value = mock_response
-
-        result = adapter.update_ticket("TEST-123", "Updated Summary", "Updated Description")
-        
-        assert result == "ticket is successfully updated"
-        mock_put.assert_called_once()
-
-    @patch('requests.put')
-    def test_update_ticket_failure(self, mock_put, adapter):
-        """Test ticket update failure."""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-        mock_put.return_value = mock_response
+        result = fresh_adapter.get_transitions("TEST-123")
+        cached = fresh_adapter.get_transitions("TEST-123")
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.update_ticket("TEST-123", "Updated Summary", "Updated Description")
-        
-        assert "Error updating ticket 404" in str(exc_info.value)
-
-    @patch('requests.get')
-    def test_list_tickets_success(self, mock_get, adapter, sample_jira_response):
-        """Test successful ticket listing."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_jira_response["list_response"]
-        mock_get.return_value = mock_response
-
-        result = adapter.list_tickets(10)
-        
-        assert len(result) == 1
-        assert result[0]["key"] == "TEST-123"
-        assert result[0]["fields"]["summary"] == "Test Issue"
-        mock_get.assert_called_once()
-
-    @patch('requests.get')
-    def test_list_tickets_failure(self, mock_get, adapter):
-        """Test ticket listing failure."""
-        mock_response = Mock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-        mock_get.return_value = mock_response
+        assert cached == result
+        assert mock_get.call_count == 1
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.list_tickets(10)
-        
-        assert "Error listing tickets 401" in str(exc_info.value)
-
-    @patch('requests.get')
-    def test_get_transitions_success(self, mock_get, adapter, sample_jira_response):
-        """Test successful transitions listing."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = sample_jira_response["transitions_response"]
-        mock_get.return_value = mock_response
-
-        result = adapter.get_transitions("TEST-123")
-        
-        assert len(result) == 3
-        assert result[0]["name"] == "To Do"
-        assert result[1]["name"] == "In Progress"
-        assert result[2]["name"] == "Done"
-        mock_get.assert_called_once()
-
-    @patch('requests.get')
-    def test_get_transitions_failure(self, mock_get, adapter):
-        """Test transitions listing failure."""
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_response.text = "Not Found"
-        mock_get.return_value = mock_response
+    @patch('requests.Session.get')
+    def test_get_transitions_refresh_skips_cache(self, mock_get, fresh_adapter, sample_jira_response, make_response):
+        """Test refresh=True fetches from Jira and re-caches the result."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.get_transitions("TEST-123")
-        
-        assert "Error getting transitions 404" in str(exc_info.value)
-
-    @patch('requests.post')
-    def test_transition_ticket_success(self, mock_post, adapter):
-        """Test successful ticket transition."""
-        mock_response = Mock()
-        mock_response.status_code = 204
-        mock_post.return_value = mock_response
-
-        result = adapter.transition_ticket("TEST-123", "21")
-        
-        assert result == "Ticket status is successfully updated"
-        mock_post.assert_called_once()
-
-    @patch('requests.post')
-    def test_transition_ticket_failure(self, mock_post, adapter):
-        """Test ticket transition failure."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-        mock_post.return_value = mock_response
+        fresh_adapter.get_transitions("TEST-123")
+        fresh_adapter.get_transitions("TEST-123", refresh=True)
+        fresh_adapter.get_transitions("TEST-123")
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.transition_ticket("TEST-123", "21")
-        
-        assert "Error transitioning ticket 400" in str(exc_info.value)
-
-    @patch('requests.post')
-    def test_add_comment_success(self, mock_post, adapter):
-        """Test successful comment addition."""
-        mock_response = Mock()
-        mock_response.status_code = 201
-        mock_post.return_value = mock_response
-
-        result = adapter.add_comment("TEST-123", "Test comment")
-        
-        assert result == "Comment is successfully added"
-        mock_post.assert_called_once()
-
-    @patch('requests.post')
-    def test_add_comment_failure(self, mock_post, adapter):
-        """Test comment addition failure."""
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.text = "Bad Request"
-        mock_post.return_value = mock_response
+        assert mock_get.call_count == 2
 
-        with pytest.raises(Exception) as exc_info:
-            adapter.add_comment("TEST-123", "Test comment")
-        
-        assert "Error adding comment 400" in str(exc_info.value)
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_get_transitions_cache_invalidated_by_transition(self, mock_get, mock_post, fresh_adapter, sample_jira_response, make_response):
+        """Test transitioning a ticket drops its cached transitions."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
+        mock_post.return_value = make_response(204)
+
+        fresh_adapter.get_transitions("TEST-123")
+        fresh_adapter.transition_ticket("TEST-123", "21")
+        fresh_adapter.get_transitions("TEST-123")
+
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[0][0] == "https://test.atlassian.net/rest/api/3/issue/TEST-123/transitions"
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_get_transitions_cache_invalidated_by_failed_transition(self, mock_get, mock_post, fresh_adapter, sample_jira_response, make_response):
+        """Test a rejected transition drops the possibly stale cached transitions."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
+        mock_post.return_value = make_response(400, text="Transition is not valid")
+
+        fresh_adapter.get_transitions("TEST-123")
+        with pytest.raises(Exception, match="Error transitioning ticket 400"):
+            fresh_adapter.transition_ticket("TEST-123", "21")
+        fresh_adapter.get_transitions("TEST-123")
+
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_get_transitions_cache_evicts_least_recently_used(self, mock_get, fresh_adapter, sample_jira_response, make_response):
+        """Test the cache keeps at most TRANSITIONS_CACHE_SIZE issues, dropping the least recently used."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
+
+        with patch.object(fresh_adapter, "TRANSITIONS_CACHE_SIZE", 2):
+            fresh_adapter.get_transitions("TEST-1")
+            fresh_adapter.get_transitions("TEST-2")
+            fresh_adapter.get_transitions("TEST-1")
+            fresh_adapter.get_transitions("TEST-3")
+
+        assert list(fresh_adapter._transitions_cache) == ["TEST-1", "TEST-3"]
+        assert mock_get.call_count == 3
+
+    @patch('requests.Session.get')
+    def test_get_transitions_cache_expires(self, mock_get, fresh_adapter, sample_jira_response, make_response):
+        """Test cached transitions are refetched after the TTL."""
+        mock_get.return_value = make_response(200, sample_jira_response["transitions_response"])
+
+        with patch('adapter.jira_api_adapter.time.monotonic', side_effect=[0, fresh_adapter.TRANSITIONS_CACHE_TTL + 1, fresh_adapter.TRANSITIONS_CACHE_TTL + 1]):
+            fresh_adapter.get_transitions("TEST-123")
+            fresh_adapter.get_transitions("TEST-123")
+
+        assert mock_get.call_count == 2
 
     def test_requests_exception_handling(self, adapter):
         """Test handling of requests exceptions."""
-        with patch('requests.post', side_effect=requests.RequestException("Connection error")):
+        with patch('requests.Session.post', side_effect=requests.RequestException("Connection error")):
             with pytest.raises(requests.RequestException) as exc_info:
                 adapter.create_ticket("Test", "Test")
             assert "Connection error" in str(exc_info.value)
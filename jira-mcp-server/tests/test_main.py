@@ -1,215 +1,165 @@
 """
 Unit tests for main.py MCP tool functions.
 """
+import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import call
 import sys
 import os
+import main
 
-# Import the functions from main.py
-from main import (
-    create_jira_ticket,
-    update_jira_ticket,
-    list_jira_tickets,
-    list_jira_statuses,
-    update_jira_status,
-    add_comment_to_jira_ticket
+
+# Shared read-only transition data; the tools never mutate adapter results
+MOCK_TRANSITIONS = (
+    {"id": "11", "name": "To Do"},
+    {"id": "21", "name": "In Progress"},
+    {"id": "31", "name": "Done"},
 )
 
 
+# tool name, adapter method, tool args, expected adapter call, adapter return value
+SUCCESS_CASES = [
+    pytest.param(
+        "create_jira_ticket", "create_ticket", ("Test Title", "Test Description"),
+        call(summary="Test Title", description_text="Test Description"),
+        "ticket TEST-123 is successfully created",
+        id="create_jira_ticket"
+    ),
+    pytest.param(
+        "update_jira_ticket", "update_ticket", ("TEST-123", "Updated Title", "Updated Description"),
+        call(issue_key="TEST-123", summary="Updated Title", description_text="Updated Description"),
+        "ticket TEST-123 is successfully updated",
+        id="update_jira_ticket"
+    ),
+    pytest.param(
+        "list_jira_tickets", "list_tickets", (10,),
+        call(max_results=10),
+        [{"key": "TEST-123", "summary": "Test Issue 1"}, {"key": "TEST-124", "summary": "Test Issue 2"}],
+        id="list_jira_tickets"
+    ),
+    pytest.param(
+        "list_jira_statuses", "get_transitions", ("TEST-123",),
+        call("TEST-123"),
+        list(MOCK_TRANSITIONS),
+        id="list_jira_statuses"
+    ),
+    pytest.param(
+        "add_comment_to_jira_ticket", "add_comment", ("TEST-123", "This is a test comment"),
+        call(issue_key="TEST-123", comment="This is a test comment"),
+        "Comment is successfully added",
+        id="add_comment_to_jira_ticket"
+    ),
+    # Edge values are passed through to the adapter unchanged
+    pytest.param(
+        "create_jira_ticket", "create_ticket", ("", ""),
+        call(summary="", description_text=""),
+        "ticket TEST-123 is successfully created",
+        id="empty-inputs"
+    ),
+    pytest.param(
+        "update_jira_ticket", "update_ticket", ("", "Title", "Description"),
+        call(issue_key="", summary="Title", description_text="Description"),
+        "ticket  is successfully updated",
+        id="empty-issue-key"
+    ),
+    pytest.param("list_jira_tickets", "list_tickets", (0,), call(max_results=0), [], id="zero-max-result"),
+    pytest.param("list_jira_tickets", "list_tickets", (-1,), call(max_results=-1), [], id="negative-max-result"),
+]
+
+# tool name, adapter method that raises, tool args, expected result (None, or a
+# substring of the returned error message)
+EXCEPTION_CASES = [
+    pytest.param(
+        "create_jira_ticket", "create_ticket", ("Test Title", "Test Description"),
+        "Error creating jira ticket: API Error",
+        id="create_jira_ticket"
+    ),
+    pytest.param(
+        "update_jira_ticket", "update_ticket", ("TEST-123", "Updated Title", "Updated Description"),
+        "Error updating jira ticket: API Error",
+        id="update_jira_ticket"
+    ),
+    pytest.param("list_jira_tickets", "list_tickets", (10,), None, id="list_jira_tickets"),
+    pytest.param("list_jira_statuses", "get_transitions", ("TEST-123",), None, id="list_jira_statuses"),
+    pytest.param("update_jira_status", "get_transitions", ("TEST-123", "In Progress"), None, id="update_jira_status"),
+    pytest.param(
+        "add_comment_to_jira_ticket", "add_comment", ("TEST-123", "This is a test comment"), None,
+        id="add_comment_to_jira_ticket"
+    ),
+]
+
+
 class TestMainFunctions:
     """Test cases for main.py MCP tool functions."""
 
-    @patch('main.adapter')
-    def test_create_jira_ticket_success(self, mock_adapter):
-        """Test successful ticket creation."""
-        mock_adapter.create_ticket.return_value = "ticket TEST-123 is successfully created"
-        
-        result = create_jira_ticket("Test Title", "Test Description")
-        
-        assert result == "ticket TEST-123 is successfully created"
-        mock_adapter.create_ticket.assert_called_once_with(
-            summary="Test Title", 
-            description_text="Test Description"
-        )
-
-    @patch('main.adapter')
-    def test_create_jira_ticket_exception(self, mock_adapter):
-        """Test ticket creation with exception."""
-        mock_adapter.create_ticket.side_effect = Exception("API Error")
-        
-        result = create_jira_ticket("Test Title", "Test Description")
-        
-        assert "Error creating jira ticket: API Error" in result
+    @pytest.mark.parametrize("tool,method,args,expected_call,return_value", SUCCESS_CASES)
+    def test_tool_success(self, mock_adapter, jira_tools, tool, method, args, expected_call, return_value):
+        """Test each tool passes its arguments through and returns the adapter result."""
+        adapter_method = getattr(mock_adapter, method)
+        adapter_method.return_value = return_value
 
-    @patch('main.adapter')
-    def test_update_jira_ticket_success(self, mock_adapter):
-        """Test successful ticket update."""
-        mock_adapter.update_ticket.return_value = "ticket TEST-123 is successfully updated"
-        
-        result = update_jira_ticket("TEST-123", "Updated Title", "Updated Description")
-        
-        assert result == "ticket TEST-123 is successfully updated"
-        mock_adapter.update_ticket.assert_called_once_with(
-            issue_key="TEST-123",
-            summary="Updated Title",
-            description_text="Updated Description"
-        )
-
-    @patch('main.adapter')
-    def test_update_jira_ticket_exception(self, mock_adapter):
-        """Test ticket update with exception."""
-        mock_adapter.update_ticket.side_effect = Exception("Update failed")
-        
-        result = update_jira_ticket("TEST-123", "Updated Title", "Updated Description")
-        
-        assert "Error updating jira ticket: Update failed" in result
-
-    @patch('main.adapter')
-    def test_list_jira_tickets_success(self, mock_adapter):
-        """Test successful ticket listing."""
-        mock_tickets = [
-            {"key": "TEST-123", "summary": "Test Issue 1"},
-            {"key": "TEST-124", "summary": "Test Issue 2"}
-        ]
-        mock_adapter.list_tickets.return_value = mock_tickets
-        
-        result = list_jira_tickets(10)
-        
-        assert result == mock_tickets
-        assert len(result) == 2
-        mock_adapter.list_tickets.assert_called_once_with(max_results=10)
-
-    @patch('main.adapter')
-    def test_list_jira_tickets_exception(self, mock_adapter):
-        """Test ticket listing with exception."""
-        mock_adapter.list_tickets.side_effect = Exception("List failed")
-        
-        result = list_jira_tickets(10)
-        
-        assert result is None
-
-    @patch('main.adapter')
-    def test_list_jira_statuses_success(self, mock_adapter):
-        """Test successful status listing."""
-        mock_statuses = [
-            {"id": "11", "name": "To Do"},
-            {"id": "21", "name": "In Progress"},
-            {"id": "31", "name": "Done"}
-        ]
-        mock_adapter.get_transitions.return_value = mock_statuses
-        
-        result = list_jira_statuses("TEST-123")
-        
-        assert result == mock_statuses
-        assert len(result) == 3
-        mock_adapter.get_transitions.assert_called_once_with("TEST-123")
+        result = getattr(jira_tools, tool)(*args)
 
-    @patch('main.adapter')
-    def test_list_jira_statuses_exception(self, mock_adapter):
-        """Test status listing with exception."""
-        mock_adapter.get_transitions.side_effect = Exception("Status list failed")
-        
-        result = list_jira_statuses("TEST-123")
-        
-        assert result is None
+        assert result == return_value
+        assert adapter_method.call_count == 1
+        assert adapter_method.call_args == expected_call
+
+    @pytest.mark.parametrize("tool,method,args,expected", EXCEPTION_CASES)
+    def test_tool_exception(self, mock_adapter, jira_tools, tool, method, args, expected):
+        """Test each tool turns an adapter exception into its error result."""
+        getattr(mock_adapter, method).side_effect = Exception("API Error")
 
-    @patch('main.adapter')
-    def test_update_jira_status_success(self, mock_adapter):
+        result = getattr(jira_tools, tool)(*args)
+
+        if expected is None:
+            assert result is None
+        else:
+            assert expected in result
+
+    def test_update_jira_status_success(self, mock_adapter, jira_tools):
         """Test successful status update."""
-        mock_transitions = [{"id": "21", "name": "In Progress"}]
-        mock_adapter.get_transitions.return_value = mock_transitions
+        mock_adapter.get_transitions.return_value = MOCK_TRANSITIONS[1:2]
         mock_adapter.transition_ticket.return_value = "Ticket status is successfully updated"
         
-        result = update_jira_status("TEST-123", "In Progress")
+        result = jira_tools.update_jira_status("TEST-123", "In Progress")
         
         assert result == "Ticket status is successfully updated"
         mock_adapter.get_transitions.assert_called_once_with("TEST-123")
         mock_adapter.transition_ticket.assert_called_once_with("TEST-123", "21")
 
-    @patch('main.adapter')
-    def test_update_jira_status_invalid_status(self, mock_adapter):
+    def test_update_jira_status_invalid_status(self, mock_adapter, jira_tools):
         """Test status update with invalid status."""
-        mock_transitions = [{"id": "21", "name": "In Progress"}]
-        mock_adapter.get_transitions.return_value = mock_transitions
+        mock_adapter.get_transitions.return_value = MOCK_TRANSITIONS[1:2]
         
-        result = update_jira_status("TEST-123", "Invalid Status")
+        result = jira_tools.update_jira_status("TEST-123", "Invalid Status")
         
         assert result == "Status is unknown"
-        mock_adapter.get_transitions.assert_called_once_with("TEST-123")
+        assert mock_adapter.get_transitions.call_args_list == [call("TEST-123"), call("TEST-123", refresh=True)]
+        mock_adapter.transition_ticket.assert_not_called()
 
-    @patch('main.adapter')
-    def test_update_jira_status_exception(self, mock_adapter):
-        """Test status update with exception."""
-        mock_adapter.get_transitions.side_effect = Exception("Status update failed")
-        
-        result = update_jira_status("TEST-123", "In Progress")
-        
-        assert result is None
+    def test_update_jira_status_refetches_stale_transitions(self, mock_adapter, jira_tools):
+        """Test a status missing from the cached transitions is looked up again."""
+        mock_adapter.get_transitions.side_effect = [MOCK_TRANSITIONS[1:2], [{"id": "41", "name": "Reopen"}]]
+        mock_adapter.transition_ticket.return_value = "Ticket status is successfully updated"
 
-    @patch('main.adapter')
-    def test_add_comment_to_jira_ticket_success(self, mock_adapter):
-        """Test successful comment addition."""
-        mock_adapter.add_comment.return_value = "Comment is successfully added"
-        
-        result = add_comment_to_jira_ticket("TEST-123", "This is a test comment")
-        
-        assert result == "Comment is successfully added"
-        mock_adapter.add_comment.assert_called_once_with(
-            issue_key="TEST-123",
-            comment="This is a test comment"
-        )
-
-    @patch('main.adapter')
-    def test_add_comment_to_jira_ticket_exception(self, mock_adapter):
-        """Test comment addition with exception."""
-        mock_adapter.add_comment.side_effect = Exception("Comment failed")
-        
-        result = add_comment_to_jira_ticket("TEST-123", "This is a test comment")
-        
-        assert result is None
+        result = jira_tools.update_jira_status("TEST-123", "Reopen")
 
+        assert result == "Ticket status is successfully updated"
+        assert mock_adapter.get_transitions.call_args_list == [call("TEST-123"), call("TEST-123", refresh=True)]
+        mock_adapter.transition_ticket.assert_called_once_with("TEST-123", "41")
 
-class TestMainFunctionInputValidation:
-    """Test cases for input validation and edge cases."""
 
-    @patch('main.adapter')
-    def test_create_jira_ticket_empty_inputs(self, mock_adapter):
-        """Test ticket creation with empty inputs."""
-        mock_adapter.create_ticket.return_value = "ticket TEST-123 is successfully created"
-        
-        result = create_jira_ticket("", "")
-        
-        mock_adapter.create_ticket.assert_called_once_with(summary="", description_text="")
+class TestMcpServer:
+    """Test cases for the lazily built MCP server."""
 
-    @patch('main.adapter')
-    def test_update_jira_ticket_empty_issue_key(self, mock_adapter):
-        """Test ticket update with empty issue key."""
-        mock_adapter.update_ticket.return_value = "ticket  is successfully updated"
-        
-        result = update_jira_ticket("", "Title", "Description")
-        
-        mock_adapter.update_ticket.assert_called_once_with(
-            issue_key="",
-            summary="Title",
-            description_text="Description"
-        )
-
-    @patch('main.adapter')
-    def test_list_jira_tickets_zero_max_result(self, mock_adapter):
-        """Test ticket listing with zero max result."""
-        mock_adapter.list_tickets.return_value = []
-        
-        result = list_jira_tickets(0)
-        
-        assert result == []
-        mock_adapter.list_tickets.assert_called_once_with(max_results=0)
+    def test_get_mcp_registers_tools_and_prompts(self):
+        """Test every tool and prompt is registered on the cached server."""
+        server = main.get_mcp()
 
-    @patch('main.adapter')
-    def test_list_jira_tickets_negative_max_result(self, mock_adapter):
-        """Test ticket listing with negative max result."""
-        mock_adapter.list_tickets.return_value = []
-        
-        result = list_jira_tickets(-1)
-        
-        mock_adapter.list_tickets.assert_called_once_with(max_results=-1)
+        tool_names = {tool.name for tool in asyncio.run(server.list_tools())}
+        prompt_names = {prompt.name for prompt in asyncio.run(server.list_prompts())}
+
+        assert tool_names == {tool.__name__ for tool in main.TOOLS}
+        assert prompt_names == {prompt.__name__ for prompt in main.PROMPTS}
+        assert main.get_mcp() is server
+        assert main.mcp is server
@@ -2,72 +2,123 @@
 Real integration tests for jira-mcp-server that make actual API calls to Jira.
 These tests require valid Jira credentials and are skipped by default.
 Run with: pytest tests/test_real_integration.py -m real_integration --jira-real
+
+Tests marked vcr record their HTTP traffic to tests/cassettes/ on the first
+run and replay it afterwards. Tests using the class-scoped shared_ticket
+are not recorded: the ticket is created live on every run, so its key
+would never match a cassette.
 """
+import logging
 import pytest
 import os
-from main import (
-    create_jira_ticket,
-    update_jira_ticket,
-    list_jira_tickets,
-    list_jira_statuses,
-    update_jira_status,
-    add_comment_to_jira_ticket
+import re
+import types
+from unittest.mock import patch
+import main
+from adapter.jira_api_adapter import JiraApiAdapter
+
+
+logger = logging.getLogger(__name__)
+# Only this module logs at DEBUG, so its records reach failure reports without
+# lowering the level for urllib3 and the rest of the suite
+logger.setLevel(logging.DEBUG)
+
+_TICKET_KEY_RE = re.compile(r'ticket (\w+-\d+)')
+
+# Captured at import time, before mocked-test fixtures patch the environment
+REAL_JIRA_ENV = {k: v for k, v in os.environ.items() if k.startswith("JIRA_")}
+
+REQUIRED_ENV_VARS = (
+    "JIRA_PROJECT_KEY",
+    "JIRA_DOMAIN",
+    "JIRA_EMAIL",
+    "JIRA_API_TOKEN"
 )
+_MISSING = [var for var in REQUIRED_ENV_VARS if not REAL_JIRA_ENV.get(var)]
+
+# Checked once at import; without credentials every test is skipped before
+# any fixture is set up.
+pytestmark = [
+    pytest.mark.real_integration,
+    pytest.mark.skipif(bool(_MISSING), reason=f"Missing required environment variables: {_MISSING}"),
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def real_adapter():
+    """Run the tools against an adapter built from the real credentials."""
+    with patch.dict(os.environ, REAL_JIRA_ENV):
+        jira_adapter = JiraApiAdapter()
+    with patch.object(main, "adapter", jira_adapter):
+        yield jira_adapter
+    jira_adapter.close()
 
 
 @pytest.fixture(scope="session")
 def jira_credentials():
-    """Check for required Jira credentials."""
-    required_env_vars = [
-        "JIRA_PROJECT_KEY",
-        "JIRA_DOMAIN", 
-        "JIRA_EMAIL",
-        "JIRA_API_TOKEN"
-    ]
-    
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
-    
-    if missing_vars:
-        pytest.skip(f"Missing required environment variables: {missing_vars}")
-    
-    return {
-        "project_key": os.getenv("JIRA_PROJECT_KEY"),
-        "domain": os.getenv("JIRA_DOMAIN"),
-        "email": os.getenv("JIRA_EMAIL"),
-        "api_token": os.getenv("JIRA_API_TOKEN")
-    }
+    """The real Jira credentials, read-only."""
+    return types.MappingProxyType({
+        "project_key": REAL_JIRA_ENV["JIRA_PROJECT_KEY"],
+        "domain": REAL_JIRA_ENV["JIRA_DOMAIN"],
+        "email": REAL_JIRA_ENV["JIRA_EMAIL"],
+        "api_token": REAL_JIRA_ENV["JIRA_API_TOKEN"]
+    })
+
+
+@pytest.fixture(scope="module")
+def created_tickets(real_adapter, jira_credentials):
+    """Collect the keys of tickets created by the tests and delete them afterwards."""
+    keys = []
+    yield keys
+    for key in keys:
+        try:
+            real_adapter.delete_ticket(key)
+        except Exception as e:
+            logger.warning("Could not delete ticket %s: %s", key, e)
 
 
 @pytest.fixture
-def test_ticket_key():
-    """Store created ticket key for cleanup."""
-    return {"key": None}
+def create_ticket(jira_tools, created_tickets, vcr):
+    """Create a ticket and register it for cleanup.
+
+    Tickets whose creation was replayed from a cassette are not registered:
+    they were already deleted at the end of the recording run.
+    """
+    def _create(title, description):
+        played = vcr.play_count if vcr else 0
+        result = jira_tools.create_jira_ticket(title, description)
+        match = _TICKET_KEY_RE.search(result or "")
+        if match and (vcr is None or vcr.play_count == played):
+            created_tickets.append(match.group(1))
+        return result
+    return _create
+
+
+@pytest.fixture(scope="class")
+def shared_ticket(jira_credentials, created_tickets, jira_tools):
+    """Create one real ticket shared by every test in the class."""
+    title = "Test Ticket from Integration Test"
+    description = "This is a test ticket created by pytest integration test. Safe to delete."
+
+    result = jira_tools.create_jira_ticket(title, description)
+
+    # Should return success message with ticket key
+    assert "successfully created" in result
+
+    match = _TICKET_KEY_RE.search(result)
+    assert match, "Could not extract ticket key from creation result"
+    created_tickets.append(match.group(1))
+    logger.debug("Created ticket: %s", match.group(1))
+    yield match.group(1)
 
 
-@pytest.mark.real_integration
 class TestRealJiraIntegration:
     """Real integration tests against actual Jira instance."""
 
-    def test_real_create_jira_ticket(self, jira_credentials, test_ticket_key):
-        """Test creating a real ticket in Jira."""
-        title = "Test Ticket from Integration Test"
-        description = "This is a test ticket created by pytest integration test. Safe to delete."
-        
-        result = create_jira_ticket(title, description)
-        
-        # Should return success message with ticket key
-        assert "successfully created" in result
-        
-        # Extract ticket key for cleanup
-        import re
-        match = re.search(r'ticket (\w+-\d+)', result)
-        if match:
-            test_ticket_key["key"] = match.group(1)
-            print(f"Created ticket: {test_ticket_key['key']}")
-
-    def test_real_list_jira_tickets(self, jira_credentials):
+    @pytest.mark.vcr
+    def test_real_list_jira_tickets(self, jira_credentials, jira_tools):
         """Test listing real tickets from Jira."""
-        result = list_jira_tickets(5)
+        result = jira_tools.list_jira_tickets(5)
         
         # Should return a list of tickets
         assert isinstance(result, list)
@@ -78,14 +129,17 @@ class TestRealJiraIntegration:
             assert "key" in ticket
             assert "fields" in ticket
             assert "summary" in ticket["fields"]
-            print(f"Found {len(result)} tickets")
+            logger.debug("Found %s tickets", len(result))
 
-    def test_real_list_jira_statuses(self, jira_credentials, test_ticket_key):
+    @pytest.mark.dependency(name="create")
+    def test_real_create_jira_ticket(self, shared_ticket, jira_credentials):
+        """Test the shared ticket was created in the configured project."""
+        assert shared_ticket.startswith(f"{jira_credentials['project_key']}-")
+
+    @pytest.mark.dependency(depends=["create"])
+    def test_real_list_jira_statuses(self, shared_ticket, jira_tools):
         """Test listing real statuses for a ticket."""
-        if not test_ticket_key["key"]:
-            pytest.skip("No test ticket available")
-        
-        result = list_jira_statuses(test_ticket_key["key"])
+        result = jira_tools.list_jira_statuses(shared_ticket)
         
         # Should return a list of available transitions
         assert isinstance(result, list)
@@ -95,143 +149,135 @@ class TestRealJiraIntegration:
         transition = result[0]
         assert "id" in transition
         assert "name" in transition
-        print(f"Available transitions: {[t['name'] for t in result]}")
+        logger.debug("Available transitions: %s", [t['name'] for t in result])
 
-    def test_real_add_comment_to_jira_ticket(self, jira_credentials, test_ticket_key):
+    @pytest.mark.dependency(depends=["create"])
+    def test_real_add_comment_to_jira_ticket(self, shared_ticket, jira_tools):
         """Test adding a real comment to a ticket."""
-        if not test_ticket_key["key"]:
-            pytest.skip("No test ticket available")
-        
         comment = "This is a test comment added by pytest integration test."
-        result = add_comment_to_jira_ticket(test_ticket_key["key"], comment)
+        result = jira_tools.add_comment_to_jira_ticket(shared_ticket, comment)
         
         # Should return success message
         assert "successfully added" in result
-        print(f"Added comment to {test_ticket_key['key']}")
+        logger.debug("Added comment to %s", shared_ticket)
 
-    def test_real_update_jira_ticket(self, jira_credentials, test_ticket_key):
+    @pytest.mark.dependency(depends=["create"])
+    def test_real_update_jira_ticket(self, shared_ticket, jira_tools):
         """Test updating a real ticket in Jira."""
-        if not test_ticket_key["key"]:
-            pytest.skip("No test ticket available")
-        
         updated_title = "Updated Test Ticket from Integration Test"
         updated_description = "This ticket has been updated by pytest integration test."
         
-        result = update_jira_ticket(test_ticket_key["key"], updated_title, updated_description)
+        result = jira_tools.update_jira_ticket(shared_ticket, updated_title, updated_description)
         
         # Should return success message
         assert "successfully updated" in result
-        print(f"Updated ticket: {test_ticket_key['key']}")
+        logger.debug("Updated ticket: %s", shared_ticket)
 
-    def test_real_update_jira_status(self, jira_credentials, test_ticket_key):
+    @pytest.mark.dependency(depends=["create"])
+    def test_real_update_jira_status(self, shared_ticket, jira_tools):
         """Test updating ticket status in real Jira."""
-        if not test_ticket_key["key"]:
-            pytest.skip("No test ticket available")
-        
         # First get available transitions
-        transitions = list_jira_statuses(test_ticket_key["key"])
+        transitions = jira_tools.list_jira_statuses(shared_ticket)
         
         if not transitions:
             pytest.skip("No transitions available")
         
         # Try to transition to the first available status
         target_status = transitions[0]["name"]
-        result = update_jira_status(test_ticket_key["key"], target_status)
+        result = jira_tools.update_jira_status(shared_ticket, target_status)
         
         # Should return success message or "Status is unknown" if already in that status
         assert ("successfully updated" in result or "Status is unknown" in result)
-        print(f"Status update result: {result}")
+        logger.debug("Status update result: %s", result)
 
 
-@pytest.mark.real_integration
+@pytest.mark.vcr
 class TestRealJiraWorkflow:
     """Test complete workflows against real Jira."""
 
-    def test_real_complete_ticket_workflow(self, jira_credentials):
+    def test_real_complete_ticket_workflow(self, jira_credentials, create_ticket, jira_tools):
         """Test a complete ticket lifecycle in real Jira."""
         # 1. Create a ticket
         title = "Complete Workflow Test Ticket"
         description = "Testing complete workflow from creation to completion."
         
-        create_result = create_jira_ticket(title, description)
+        create_result = create_ticket(title, description)
         assert "successfully created" in create_result
         
         # Extract ticket key
-        import re
-        match = re.search(r'ticket (\w+-\d+)', create_result)
+        match = _TICKET_KEY_RE.search(create_result)
         assert match, "Could not extract ticket key from creation result"
         ticket_key = match.group(1)
-        print(f"Created workflow test ticket: {ticket_key}")
+        logger.debug("Created workflow test ticket: %s", ticket_key)
         
         try:
             # 2. Update the ticket
             updated_title = "Updated Complete Workflow Test Ticket"
             updated_description = "This ticket has been updated as part of workflow test."
             
-            update_result = update_jira_ticket(ticket_key, updated_title, updated_description)
+            update_result = jira_tools.update_jira_ticket(ticket_key, updated_title, updated_description)
             assert "successfully updated" in update_result
-            print(f"Updated ticket: {ticket_key}")
+            logger.debug("Updated ticket: %s", ticket_key)
             
             # 3. Add a comment
             comment = "Workflow test comment - this ticket is being tested end-to-end."
-            comment_result = add_comment_to_jira_ticket(ticket_key, comment)
+            comment_result = jira_tools.add_comment_to_jira_ticket(ticket_key, comment)
             assert "successfully added" in comment_result
-            print(f"Added comment to: {ticket_key}")
+            logger.debug("Added comment to: %s", ticket_key)
             
             # 4. List available transitions
-            transitions = list_jira_statuses(ticket_key)
+            transitions = jira_tools.list_jira_statuses(ticket_key)
             assert isinstance(transitions, list)
-            print(f"Available transitions: {[t['name'] for t in transitions]}")
+            logger.debug("Available transitions: %s", [t['name'] for t in transitions])
             
             # 5. Try to transition if possible
             if transitions:
                 target_status = transitions[0]["name"]
-                status_result = update_jira_status(ticket_key, target_status)
-                print(f"Status transition result: {status_result}")
+                status_result = jira_tools.update_jira_status(ticket_key, target_status)
+                logger.debug("Status transition result: %s", status_result)
             
             # 6. Verify ticket appears in listing
-            tickets = list_jira_tickets(10)
+            tickets = jira_tools.list_jira_tickets(10)
             ticket_keys = [t["key"] for t in tickets] if tickets else []
             # Note: The ticket might not appear immediately due to indexing delays
-            print(f"Ticket listing contains {len(ticket_keys)} tickets")
+            logger.debug("Ticket listing contains %s tickets", len(ticket_keys))
             
-            print(f"✅ Complete workflow test successful for ticket: {ticket_key}")
+            logger.debug("✅ Complete workflow test successful for ticket: %s", ticket_key)
             
         except Exception as e:
-            print(f"❌ Workflow test failed for ticket {ticket_key}: {e}")
+            logger.error("❌ Workflow test failed for ticket %s: %s", ticket_key, e)
             raise
 
 
-@pytest.mark.real_integration
+@pytest.mark.vcr
 class TestRealJiraErrorHandling:
     """Test error handling with real Jira API."""
 
-    def test_real_invalid_ticket_key(self, jira_credentials):
+    def test_real_invalid_ticket_key(self, jira_credentials, jira_tools):
         """Test operations with invalid ticket key."""
         invalid_key = "INVALID-999999"
         
         # These should handle errors gracefully
-        update_result = update_jira_ticket(invalid_key, "Test", "Test")
+        update_result = jira_tools.update_jira_ticket(invalid_key, "Test", "Test")
         assert "Error updating jira ticket" in update_result
         
-        comment_result = add_comment_to_jira_ticket(invalid_key, "Test comment")
+        comment_result = jira_tools.add_comment_to_jira_ticket(invalid_key, "Test comment")
         assert comment_result is None  # Should return None on exception
         
-        status_result = list_jira_statuses(invalid_key)
+        status_result = jira_tools.list_jira_statuses(invalid_key)
         assert status_result is None  # Should return None on exception
 
-    def test_real_invalid_status_transition(self, jira_credentials):
+    def test_real_invalid_status_transition(self, jira_credentials, create_ticket, jira_tools):
         """Test invalid status transition."""
         # First create a ticket to test with
-        create_result = create_jira_ticket("Invalid Status Test", "Testing invalid status")
+        create_result = create_ticket("Invalid Status Test", "Testing invalid status")
         
         if "successfully created" in create_result:
-            import re
-            match = re.search(r'ticket (\w+-\d+)', create_result)
+            match = _TICKET_KEY_RE.search(create_result)
             if match:
                 ticket_key = match.group(1)
                 
                 # Try invalid status
-                result = update_jira_status(ticket_key, "INVALID_STATUS_NAME")
+                result = jira_tools.update_jira_status(ticket_key, "INVALID_STATUS_NAME")
                 assert result == "Status is unknown"
-                print(f"Invalid status test passed for: {ticket_key}")
+                logger.debug("Invalid status test passed for: %s", ticket_key)